@@ -10,13 +10,18 @@ Unified Picrawler Control Hub
 
 import cv2
 import numpy as np
+import asyncio
 import threading
+import queue
 import time
-import readchar
+import os
+import sys
+import termios
+import tty
 import json
+import codecs
 from datetime import datetime
-import matplotlib.pyplot as plt
-from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 try:
     from picrawler import Picrawler
@@ -26,14 +31,62 @@ except ImportError:
     Picrawler = None
     RadiationBot = None
 
+# Telemetry record layout for the hub's data log ring buffer
+LOG_DTYPE = np.dtype([('t', 'f8'), ('x', 'f4'), ('y', 'f4'), ('cpm', 'f4'), ('usv', 'f4')])
+LOG_SIZE = 1000
+
 class PicrawlerControlHub:
     def __init__(self):
         self.running = False
-        self.video_thread = None
-        self.display_thread = None
+        self.map_thread = None
         self.camera = None
-        self.current_frame = None
-        self.frame_lock = threading.Lock()
+        self._frame_ready = None  # asyncio.Event, created on the event loop
+        self._frame_seq = 0  # Frames published so far
+        
+        # Key commands block on robot motion, so they run off the event
+        # loop on a single worker to keep them in order
+        self._commands = ThreadPoolExecutor(max_workers=1)
+        # Stdin arrives a byte at a time; multi-byte keys are reassembled here
+        self._key_decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+        
+        # Preallocated triple buffer: capture fills the back slot while the
+        # display shows its claimed slot; handing a frame over only swaps
+        # indices, so pixels are never copied
+        self._frame_pool = [np.empty((480, 640, 3), np.uint8) for _ in range(3)]
+        self._write_idx = 0
+        self._read_idx = -1  # Latest published slot, -1 until the first frame
+        self._display_idx = -1  # Slot currently being shown
+        self._display_frames = [None] * len(self._frame_pool)  # What each slot shows
+        
+        # Compose overlays on OpenCL-backed UMats when a device is available
+        self.use_opencl = cv2.ocl.haveOpenCL()
+        cv2.ocl.setUseOpenCL(self.use_opencl)
+        
+        # Status panel background, blended into the frame ROI in place
+        self._panel = np.zeros((191, 341, 3), np.uint8)
+        self._panel_alpha = 0.7
+        self._overlay_cache = None
+        self._overlay_mask = None
+        self._overlay_lines = []  # (text, color, scale, thickness) per panel line
+        self._lines_dirty = True  # Status changed; strings need formatting
+        self._overlay_dirty = True  # Lines changed; sprite needs rasterizing
+        if self.use_opencl:
+            self._panel_um = cv2.UMat(self._panel)
+            self._overlay_cache_um = None
+            self._overlay_mask_um = None
+        
+        # Static part of the mock frame, drawn once and copied per frame
+        self._mock_bg = np.zeros((480, 640, 3), np.uint8)
+        self._mock_bg[50:431, 50:591] = 40  # Mock environment
+        cv2.circle(self._mock_bg, (320, 240), 30, (0, 255, 0), -1)  # Robot position
+        self._mock_bg[80:401, 80:571:70] = 80  # Vertical grid lines
+        self._mock_bg[80:401:80, 80:561] = 80  # Horizontal grid lines
+        
+        # Mock timestamp: the prefix is baked into the background and the
+        # clock is blitted from per-character sprites
+        prefix = "MOCK FEED "
+        cv2.putText(self._mock_bg, prefix, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+        self._clock_sprites, self._clock_slots = self._build_clock_sprites(prefix, (10, 30))
         
         # Robot setup
         if RadiationBot:
@@ -42,6 +95,14 @@ class PicrawlerControlHub:
             self.robot = None
             print("Mock mode: No physical robot")
         
+        # Resolve robot hooks once rather than probing attributes per update
+        sensor = getattr(self.robot, 'sensor', None)
+        tracker = getattr(self.robot, 'tracker', None)
+        self._sensor_read = getattr(sensor, 'get_reading', None)
+        self._sensor_to_microsv = getattr(sensor, 'convert_to_microsieverts', None)
+        self._tracker_pos = getattr(tracker, 'get_position', None)
+        self._has_samples = hasattr(self.robot, 'sample_count')
+        
         # Status variables
         self.status = {
             'position': (0, 0, 0),
@@ -59,9 +120,20 @@ class PicrawlerControlHub:
         self.overlay_enabled = True
         self.recording = False
         self.video_writer = None
+        self._writer_q = None
+        self._writer_thread = None
+        self._dropped_frames = 0
         
-        # Data logging
-        self.data_log = deque(maxlen=1000)
+        # Terminal settings saved while stdin is in cbreak mode
+        self._tty_attrs = None
+        
+        # Data logging: fixed-size ring of packed records, _log_head counts
+        # every sample ever written
+        self.data_log = np.zeros(LOG_SIZE, dtype=LOG_DTYPE)
+        self._log_head = 0
+        self._log_lock = threading.Lock()
+        self._flushed_head = 0  # Samples already appended to the session log file
+        self._log_file = None
         
     def initialize_camera(self):
         """Initialize camera for video feed"""
@@ -73,6 +145,9 @@ class PicrawlerControlHub:
                 return False
             
             # Set camera properties
+            # Ask for MJPG before the frame size: V4L2 defaults to YUYV, which
+            # needs a per-frame software YUV->BGR conversion
+            self.camera.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
             self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
             self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
             self.camera.set(cv2.CAP_PROP_FPS, 30)
@@ -84,79 +159,101 @@ class PicrawlerControlHub:
             self.camera = None
             return False
     
-    def create_mock_frame(self):
-        """Create mock video frame for testing"""
-        frame = np.zeros((480, 640, 3), dtype=np.uint8)
-        
-        # Create mock environment
-        cv2.rectangle(frame, (50, 50), (590, 430), (40, 40, 40), -1)
-        cv2.circle(frame, (320, 240), 30, (0, 255, 0), -1)  # Robot position
-        
-        # Add grid
-        for i in range(8):
-            x = 80 + i * 70
-            cv2.line(frame, (x, 80), (x, 400), (80, 80, 80), 1)
-        for i in range(5):
-            y = 80 + i * 80
-            cv2.line(frame, (80, y), (560, y), (80, 80, 80), 1)
+    def _build_clock_sprites(self, prefix, org, font=cv2.FONT_HERSHEY_SIMPLEX, scale=0.7, thickness=2):
+        """Render HH:MM:SS glyph sprites and the top-left corner of each clock slot"""
+        (zero_width, height), baseline = cv2.getTextSize("0", font, scale, thickness)
+        pad = thickness + 2
+        ascent = height + pad
+        rows = height + baseline + 2 * pad
+        
+        sprites = {}
+        for ch in "0123456789:":
+            width = cv2.getTextSize(ch, font, scale, thickness)[0][0]
+            sprite = np.zeros((rows, width + 2 * pad, 3), np.uint8)
+            cv2.putText(sprite, ch, (pad, ascent), font, scale, (255, 255, 255), thickness)
+            sprites[ch] = sprite
+        
+        slots = []
+        template = "00:00:00"
+        for i in range(len(template)):
+            # Pen position where putText would start character i of the full string
+            head = cv2.getTextSize(prefix + template[:i] + "0", font, scale, thickness)[0][0]
+            slots.append((org[1] - ascent, org[0] + head - zero_width - pad))
+        return sprites, slots
+    
+    def create_mock_frame(self, frame=None):
+        """Create mock video frame for testing, drawing into frame if given"""
+        if frame is None or frame.shape != self._mock_bg.shape:
+            frame = np.empty_like(self._mock_bg)
+        np.copyto(frame, self._mock_bg)
         
         # Add timestamp
         timestamp = datetime.now().strftime("%H:%M:%S")
-        cv2.putText(frame, f"MOCK FEED {timestamp}", (10, 30), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+        for ch, (y, x) in zip(timestamp, self._clock_slots):
+            sprite = self._clock_sprites[ch]
+            roi = frame[y:y + sprite.shape[0], x:x + sprite.shape[1]]
+            np.maximum(roi, sprite, out=roi)  # Sprite boxes overlap; keep both strokes
         
         return frame
     
-    def video_capture_loop(self):
+    async def video_capture_loop(self):
         """Main video capture loop"""
+        loop = asyncio.get_running_loop()
         while self.running:
             try:
+                frame = self._frame_pool[self._write_idx]
                 if self.camera and self.camera.isOpened():
-                    ret, frame = self.camera.read()
+                    # Only the blocking read leaves the event loop
+                    ret, frame = await loop.run_in_executor(None, self.camera.read, frame)
                     if not ret:
-                        frame = self.create_mock_frame()
+                        frame = self.create_mock_frame(frame)
                 else:
-                    frame = self.create_mock_frame()
+                    frame = self.create_mock_frame(frame)
+                # Keep whatever buffer was actually filled so it is reused next lap
+                self._frame_pool[self._write_idx] = frame
+                
+                # Overlay drawing accepts UMat, so let OpenCL run it
+                if self.use_opencl:
+                    frame = cv2.UMat(frame)
                 
                 # Add overlay if enabled
                 if self.overlay_enabled:
                     frame = self.add_status_overlay(frame)
+                self._display_frames[self._write_idx] = frame
                 
-                # Store frame
-                with self.frame_lock:
-                    self.current_frame = frame.copy()
+                # Publish frame by index, then take a back buffer that is
+                # neither the new front nor the one on screen
+                self._read_idx = self._write_idx
+                self._frame_seq += 1
+                busy = (self._read_idx, self._display_idx)
+                self._write_idx = next(i for i in range(len(self._frame_pool)) if i not in busy)
+                self._frame_ready.set()
                 
-                # Record if enabled
-                if self.recording and self.video_writer:
-                    self.video_writer.write(frame)
+                # Record if enabled; encoding happens on the writer thread and
+                # frames are dropped rather than stalling capture
+                writer_q = self._writer_q
+                if self.recording and writer_q:
+                    try:
+                        writer_q.put_nowait(frame.get() if self.use_opencl else frame.copy())
+                    except queue.Full:
+                        self._dropped_frames += 1
                     
             except Exception as e:
                 print(f"Video capture error: {e}")
-                time.sleep(0.1)
+                await asyncio.sleep(0.1)
             
-            time.sleep(1/30)  # 30 FPS
+            await asyncio.sleep(1/30)  # 30 FPS
     
-    def add_status_overlay(self, frame):
-        """Add status information overlay to video frame"""
-        overlay = frame.copy()
-        
-        # Semi-transparent background for text
-        cv2.rectangle(overlay, (10, 10), (350, 200), (0, 0, 0), -1)
-        cv2.addWeighted(overlay, 0.7, frame, 0.3, 0, frame)
-        
-        # Status information
-        y_offset = 35
-        line_height = 25
-        
-        # Robot status
+    def _set_status(self, key, value):
+        """Update a status field, marking the overlay text for redraw on change"""
+        if self.status[key] != value:
+            self.status[key] = value
+            self._lines_dirty = True
+    
+    def _format_overlay_lines(self):
+        """Format the status panel strings once per status change"""
+        self._lines_dirty = False
         pos = self.status['position']
-        cv2.putText(frame, f"Position: ({pos[0]:.1f}, {pos[1]:.1f})", 
-                   (15, y_offset), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
-        y_offset += line_height
-        
-        cv2.putText(frame, f"Heading: {pos[2]:.0f}°", 
-                   (15, y_offset), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
-        y_offset += line_height
         
         # Radiation data
         rad_color = (0, 255, 255)  # Yellow
@@ -165,21 +262,52 @@ class PicrawlerControlHub:
         elif self.status['radiation_cpm'] > 50:
             rad_color = (0, 165, 255)  # Orange
         
-        cv2.putText(frame, f"Radiation: {self.status['radiation_cpm']:.1f} CPM", 
-                   (15, y_offset), cv2.FONT_HERSHEY_SIMPLEX, 0.6, rad_color, 2)
-        y_offset += line_height
-        
-        cv2.putText(frame, f"Dose: {self.status['radiation_microsv']:.2f} µSv/h", 
-                   (15, y_offset), cv2.FONT_HERSHEY_SIMPLEX, 0.6, rad_color, 2)
-        y_offset += line_height
-        
-        # Mode and controls
-        cv2.putText(frame, f"Mode: {self.status['mode']}", 
-                   (15, y_offset), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
-        y_offset += line_height
-        
-        cv2.putText(frame, f"Last: {self.status['last_action']}", 
-                   (15, y_offset), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+        self._overlay_lines = [
+            (f"Position: ({pos[0]:.1f}, {pos[1]:.1f})", (0, 255, 0), 0.6, 2),
+            (f"Heading: {pos[2]:.0f}°", (0, 255, 0), 0.6, 2),
+            (f"Radiation: {self.status['radiation_cpm']:.1f} CPM", rad_color, 0.6, 2),
+            (f"Dose: {self.status['radiation_microsv']:.2f} µSv/h", rad_color, 0.6, 2),
+            (f"Mode: {self.status['mode']}", (255, 255, 0), 0.6, 2),
+            (f"Last: {self.status['last_action']}", (255, 255, 255), 0.5, 1),
+        ]
+        self._overlay_dirty = True
+    
+    def _render_overlay_text(self):
+        """Rasterize the status panel text into the cached overlay sprite"""
+        # Clear first so a status change during rendering triggers another pass
+        self._overlay_dirty = False
+        sprite = np.zeros_like(self._panel)
+        
+        # Status information (coordinates relative to the panel origin)
+        y_offset = 25
+        line_height = 25
+        for text, color, scale, thickness in self._overlay_lines:
+            cv2.putText(sprite, text, (5, y_offset), cv2.FONT_HERSHEY_SIMPLEX, scale, color, thickness)
+            y_offset += line_height
+        
+        self._overlay_cache = sprite
+        self._overlay_mask = sprite.any(axis=2, keepdims=True)
+        if self.use_opencl:
+            self._overlay_cache_um = cv2.UMat(sprite)
+            self._overlay_mask_um = cv2.UMat(self._overlay_mask[:, :, 0].astype(np.uint8))
+    
+    def add_status_overlay(self, frame):
+        """Add status information overlay to video frame (in place)"""
+        # Status text only changes with self.status, so reuse the cached sprite
+        if self._lines_dirty and not self._overlay_lines:
+            self._format_overlay_lines()  # First frame before any status tick
+        if self._overlay_dirty:
+            self._render_overlay_text()
+        
+        # Semi-transparent background for text, covering (10, 10)-(350, 200)
+        if isinstance(frame, cv2.UMat):
+            roi = cv2.UMat(frame, (10, 201), (10, 351))
+            cv2.addWeighted(self._panel_um, self._panel_alpha, roi, 1 - self._panel_alpha, 0, dst=roi)
+            cv2.copyTo(self._overlay_cache_um, self._overlay_mask_um, dst=roi)
+        else:
+            roi = frame[10:201, 10:351]
+            cv2.addWeighted(self._panel, self._panel_alpha, roi, 1 - self._panel_alpha, 0, dst=roi)
+            np.copyto(roi, self._overlay_cache, where=self._overlay_mask)
         
         # Recording indicator
         if self.recording:
@@ -192,39 +320,77 @@ class PicrawlerControlHub:
         
         return frame
     
-    def display_loop(self):
+    async def display_loop(self):
         """Display video feed"""
+        last_seen = 0
         while self.running:
-            with self.frame_lock:
-                if self.current_frame is not None:
-                    cv2.imshow('Picrawler Control Hub', self.current_frame)
+            # Wake on a new frame, or after one frame interval so the window
+            # keeps handling events while the camera stalls
+            try:
+                await asyncio.wait_for(self._frame_ready.wait(), 1/30)
+            except asyncio.TimeoutError:
+                pass
+            self._frame_ready.clear()
             
-            key = cv2.waitKey(1) & 0xFF
-            if key == 27:  # ESC
-                self.stop()
+            try:
+                # Only redraw when capture has published a new frame
+                if self._frame_seq != last_seen:
+                    last_seen = self._frame_seq
+                    # Claim the front buffer so capture won't read into it
+                    idx = self._display_idx = self._read_idx
+                    cv2.imshow('Picrawler Control Hub', self._display_frames[idx])
+                
+                key = cv2.waitKey(1) & 0xFF
+            except Exception as e:
+                # No display (headless build or no X): keep the rest of the hub running
+                print(f"Video display error: {e}; display disabled")
+                self.video_enabled = False
+                self._display_idx = -1
                 break
             
-            time.sleep(1/30)
+            if key == 27:  # ESC
+                self.request_stop()
+                break
     
     def update_status(self):
         """Update robot status"""
-        if self.robot:
-            self.status['position'] = self.robot.tracker.get_position()
-            
-            # Get radiation reading
-            try:
-                if hasattr(self.robot, 'sensor'):
-                    cpm = self.robot.sensor.get_reading()
-                    microsv = self.robot.sensor.convert_to_microsieverts(cpm)
-                    self.status['radiation_cpm'] = cpm
-                    self.status['radiation_microsv'] = microsv
-                    
-                    if cpm > self.status['max_radiation']:
-                        self.status['max_radiation'] = cpm
-            except:
-                pass
+        self.update_position()
+        self.update_radiation()
+    
+    def update_position(self):
+        """Update tracked robot position (cheap, polled often)"""
+        if self._tracker_pos:
+            self._set_status('position', self._tracker_pos())
+    
+    def update_radiation(self):
+        """Update radiation reading and sample count (polled slowly)"""
+        # Get radiation reading
+        if self._sensor_read:
+            cpm = self._sensor_read()
+            microsv = self._sensor_to_microsv(cpm)
+            self._set_status('radiation_cpm', cpm)
+            self._set_status('radiation_microsv', microsv)
+            self._log_sample(cpm, microsv)
             
-            self.status['total_samples'] = len(self.robot.radiation_data) if hasattr(self.robot, 'radiation_data') else 0
+            if cpm > self.status['max_radiation']:
+                self._set_status('max_radiation', cpm)
+        
+        if self._has_samples:
+            self._set_status('total_samples', self.robot.sample_count)
+    
+    def _log_sample(self, cpm, microsv):
+        """Append a telemetry sample to the data log ring buffer"""
+        x, y, _ = self.status['position']
+        with self._log_lock:
+            self.data_log[self._log_head % LOG_SIZE] = (time.time(), x, y, cpm, microsv)
+            self._log_head += 1
+    
+    def _log_snapshot(self):
+        """Return the logged samples in chronological order"""
+        with self._log_lock:
+            if self._log_head <= LOG_SIZE:
+                return self.data_log[:self._log_head].copy()
+            return np.roll(self.data_log, -(self._log_head % LOG_SIZE))
     
     def start_recording(self):
         """Start video recording"""
@@ -234,106 +400,133 @@ class PicrawlerControlHub:
             
             fourcc = cv2.VideoWriter_fourcc(*'mp4v')
             self.video_writer = cv2.VideoWriter(filename, fourcc, 30.0, (640, 480))
+            
+            self._dropped_frames = 0
+            self._writer_q = queue.Queue(maxsize=4)
+            self._writer_thread = threading.Thread(target=self._writer_loop,
+                                                   args=(self._writer_q, self.video_writer))
+            self._writer_thread.daemon = True
+            self._writer_thread.start()
+            
             self.recording = True
             print(f"Recording started: {filename}")
     
+    def _writer_loop(self, frames, writer):
+        """Encode queued frames until the None sentinel arrives"""
+        while True:
+            frame = frames.get()
+            if frame is None:
+                break
+            writer.write(frame)
+    
     def stop_recording(self):
         """Stop video recording"""
         if self.recording:
             self.recording = False
+            if self._writer_q:
+                self._writer_q.put(None)
+                self._writer_thread.join()
+                self._writer_q = None
+                self._writer_thread = None
             if self.video_writer:
                 self.video_writer.release()
                 self.video_writer = None
-            print("Recording stopped")
+            if self._dropped_frames:
+                print(f"Recording stopped ({self._dropped_frames} frames dropped)")
+            else:
+                print("Recording stopped")
     
-    def keyboard_control_loop(self):
+    def _on_key(self):
+        """Read a key once the event loop reports stdin readable"""
+        data = os.read(sys.stdin.fileno(), 1)
+        if not data:  # stdin closed
+            self.request_stop()
+            return
+        key = self._key_decoder.decode(data)
+        if not key:  # Partial or undecodable multi-byte key
+            return
+        if key == '\x1b':  # ESC
+            self.request_stop()
+            return
+        self._commands.submit(self._run_command, key)
+    
+    def _run_command(self, key):
+        """Run a key command on the command worker"""
+        try:
+            self.handle_key(key)
+        except Exception as e:
+            print(f"Command error: {e}")
+    
+    def handle_key(self, key):
         """Handle keyboard input for robot control"""
-        print("\n=== PICRAWLER CONTROL HUB ===")
-        print("Movement: WASD | Stand/Sit: Q/E")
-        print("Radiation: R | Demo: SPACE | Record: Shift+R")
-        print("Help: H | Quit: ESC")
-        print("=====================================\n")
+        # Robot movement
+        if key.lower() == 'w':
+            self.move_robot('forward', 2)
+        elif key.lower() == 's':
+            self.move_robot('backward', 2)
+        elif key.lower() == 'a':
+            self.move_robot('turn left', 1)
+        elif key.lower() == 'd':
+            self.move_robot('turn right', 1)
+        elif key.lower() == 'q':
+            self.robot_action('stand')
+        elif key.lower() == 'e':
+            self.robot_action('sit')
+        
+        # Radiation and demo functions
+        elif key.lower() == 'r':
+            if key.isupper():  # Shift+R
+                if self.recording:
+                    self.stop_recording()
+                else:
+                    self.start_recording()
+            else:
+                self.take_radiation_reading()
         
-        while self.running:
-            try:
-                key = readchar.readchar()
-                
-                if key == '\x1b':  # ESC
-                    self.stop()
-                    break
-                
-                # Robot movement
-                elif key.lower() == 'w':
-                    self.move_robot('forward', 2)
-                elif key.lower() == 's':
-                    self.move_robot('backward', 2)
-                elif key.lower() == 'a':
-                    self.move_robot('turn left', 1)
-                elif key.lower() == 'd':
-                    self.move_robot('turn right', 1)
-                elif key.lower() == 'q':
-                    self.robot_action('stand')
-                elif key.lower() == 'e':
-                    self.robot_action('sit')
-                
-                # Radiation and demo functions
-                elif key.lower() == 'r':
-                    if key.isupper():  # Shift+R
-                        if self.recording:
-                            self.stop_recording()
-                        else:
-                            self.start_recording()
-                    else:
-                        self.take_radiation_reading()
-                
-                elif key == ' ':  # SPACE
-                    self.run_demo_mode()
-                
-                # Utility functions
-                elif key.lower() == 'o':
-                    self.overlay_enabled = not self.overlay_enabled
-                    print(f"Overlay {'enabled' if self.overlay_enabled else 'disabled'}")
-                
-                elif key.lower() == 'h':
-                    self.show_help()
-                
-                elif key.lower() == 'v':
-                    self.save_data()
-                
-                elif key.lower() == 'm':
-                    self.generate_map()
-                
-            except KeyboardInterrupt:
-                self.stop()
-                break
+        elif key == ' ':  # SPACE
+            self.run_demo_mode()
+        
+        # Utility functions
+        elif key.lower() == 'o':
+            self.overlay_enabled = not self.overlay_enabled
+            print(f"Overlay {'enabled' if self.overlay_enabled else 'disabled'}")
+        
+        elif key.lower() == 'h':
+            self.show_help()
+        
+        elif key.lower() == 'v':
+            self.save_data()
+        
+        elif key.lower() == 'm':
+            self.generate_map()
     
     def move_robot(self, action, steps):
         """Execute robot movement"""
         if self.robot:
             self.robot.move_and_track(action, steps)
-            self.status['last_action'] = f"{action} {steps}"
+            self._set_status('last_action', f"{action} {steps}")
             self.update_status()
     
     def robot_action(self, action):
         """Execute robot action"""
         if self.robot:
             self.robot.do_action(action, 1, 80)
-            self.status['last_action'] = action
+            self._set_status('last_action', action)
     
     def take_radiation_reading(self):
         """Take radiation reading at current position"""
         if self.robot and hasattr(self.robot, 'collect_radiation_sample'):
-            self.status['mode'] = 'Sampling'
+            self._set_status('mode', 'Sampling')
             print("Taking radiation reading...")
             reading = self.robot.collect_radiation_sample(3)
-            self.status['mode'] = 'Manual'
+            self._set_status('mode', 'Manual')
             self.update_status()
             print(f"Radiation: {reading:.1f} CPM")
     
     def run_demo_mode(self):
         """Run autonomous demo"""
         if self.robot and hasattr(self.robot, 'demo_mode'):
-            self.status['mode'] = 'Demo'
+            self._set_status('mode', 'Demo')
             print("Starting demo mode...")
             
             # Run demo in separate thread to keep video going
@@ -343,15 +536,97 @@ class PicrawlerControlHub:
     
     def generate_map(self):
         """Generate and save radiation heatmap"""
+        if self.map_thread and self.map_thread.is_alive():
+            print("Map generation already in progress")
+            return
+        
+        # Plotting is slow, so keep input handling responsive
+        self.map_thread = threading.Thread(target=self._generate_map_bg)
+        self.map_thread.daemon = True
+        self.map_thread.start()
+    
+    def _generate_map_bg(self):
+        """Build the robot heatmap and a binned map of the telemetry log"""
+        # Imported on first use; Agg renders off-screen and is safe off the main thread
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        
         if self.robot and hasattr(self.robot, 'generate_heatmap'):
             self.robot.generate_heatmap()
             print("Heatmap generated!")
+        
+        log = self._log_snapshot()
+        if not len(log):
+            return
+        
+        # Mean CPM per cell from two vectorized binning passes
+        x, y, cpm = log['x'], log['y'], log['cpm']
+        counts, xedges, yedges = np.histogram2d(x, y, bins=64)
+        sums, _, _ = np.histogram2d(x, y, bins=[xedges, yedges], weights=cpm)
+        mean_cpm = np.divide(sums, counts, out=np.full_like(sums, np.nan), where=counts > 0)
+        
+        save_file = "telemetry_heatmap.png"
+        plt.figure(figsize=(10, 8))
+        plt.imshow(mean_cpm.T, origin='lower', cmap='hot', aspect='auto',
+                   extent=(xedges[0], xedges[-1], yedges[0], yedges[-1]))
+        plt.colorbar(label='Mean Radiation (CPM)')
+        plt.xlabel('X Position (cm)')
+        plt.ylabel('Y Position (cm)')
+        plt.title('Telemetry Radiation Map')
+        plt.savefig(save_file, dpi=150, bbox_inches='tight')
+        plt.close()
+        print(f"Telemetry map saved as {save_file}")
     
     def save_data(self):
         """Save collected data"""
         if self.robot and hasattr(self.robot, 'save_data'):
             self.robot.save_data()
             print("Data saved!")
+        if self._log_head:
+            self._save_binary(self._log_filename())
+    
+    def _log_filename(self, ext='npz'):
+        """Timestamped filename for a telemetry log file"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return f"picrawler_log_{timestamp}.{ext}"
+    
+    def _save_binary(self, path):
+        """Save the telemetry log and status summary as compressed NumPy arrays"""
+        np.savez_compressed(path,
+                            log=self._log_snapshot(),
+                            position=np.array(self.status['position'], dtype=np.float32),
+                            max_radiation=self.status['max_radiation'],
+                            total_samples=self.status['total_samples'])
+        print(f"Telemetry log saved to {path}")
+    
+    def _flush_log(self):
+        """Append samples logged since the last flush to the session log file
+        
+        The file holds raw LOG_DTYPE records; load it with
+        np.fromfile(path, dtype=LOG_DTYPE).
+        """
+        with self._log_lock:
+            head = self._log_head
+            # Anything older than one ring length has already been overwritten
+            start = max(self._flushed_head, head - LOG_SIZE)
+            if start == head:
+                return
+            
+            i, j = start % LOG_SIZE, head % LOG_SIZE
+            if i < j:
+                chunks = [self.data_log[i:j]]
+            else:  # New samples wrap around the end of the ring
+                chunks = [self.data_log[i:], self.data_log[:j]]
+            
+            if self._log_file is None:
+                path = self._log_filename('bin')
+                self._log_file = open(path, 'ab')
+                print(f"Logging telemetry to {path}")
+            for chunk in chunks:
+                chunk.tofile(self._log_file)
+            self._log_file.flush()
+            self._flushed_head = head
     
     def show_help(self):
         """Display help information"""
@@ -378,52 +653,114 @@ class PicrawlerControlHub:
         # Initialize camera
         self.initialize_camera()
         
-        # Start threads
-        self.video_thread = threading.Thread(target=self.video_capture_loop)
-        self.video_thread.daemon = True
-        self.video_thread.start()
+        # Deliver keypresses immediately, without waiting for Enter
+        if sys.stdin.isatty():
+            self._tty_attrs = termios.tcgetattr(sys.stdin.fileno())
+            tty.setcbreak(sys.stdin.fileno())
         
-        if self.video_enabled:
-            self.display_thread = threading.Thread(target=self.display_loop)
-            self.display_thread.daemon = True
-            self.display_thread.start()
+        print("\n=== PICRAWLER CONTROL HUB ===")
+        print("Movement: WASD | Stand/Sit: Q/E")
+        print("Radiation: R | Demo: SPACE | Record: Shift+R")
+        print("Help: H | Quit: ESC")
+        print("=====================================\n")
+        
+        # Capture, display, status and keyboard share one event loop
+        asyncio.run(self._main_async())
+    
+    async def _main_async(self):
+        """Run the hub tasks until a stop is requested"""
+        loop = asyncio.get_running_loop()
+        self._frame_ready = asyncio.Event()
         
-        # Update status periodically
-        status_thread = threading.Thread(target=self.status_update_loop)
-        status_thread.daemon = True
-        status_thread.start()
+        # Keyboard input arrives as a reader callback instead of a blocking loop
+        keyboard = sys.stdin.isatty()
+        if keyboard:
+            loop.add_reader(sys.stdin.fileno(), self._on_key)
         
-        # Start keyboard control (main thread)
-        self.keyboard_control_loop()
+        tasks = [self.video_capture_loop(), self.status_update_loop()]
+        if self.video_enabled:
+            tasks.append(self.display_loop())
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            if keyboard:
+                loop.remove_reader(sys.stdin.fileno())
     
-    def status_update_loop(self):
-        """Periodically update status"""
+    async def status_update_loop(self):
+        """Periodically update status: position at 5 Hz, radiation at 1 Hz"""
+        last_flush = time.time()
+        tick = 0
         while self.running:
-            self.update_status()
-            time.sleep(0.5)
+            try:
+                self.update_position()
+                if tick % 5 == 0:
+                    self.update_radiation()
+            except Exception as e:
+                print(f"Status update error: {e}")
+            tick += 1
+            
+            # Format overlay strings here, at most once per tick, not per frame
+            if self._lines_dirty:
+                self._format_overlay_lines()
+            
+            # Batch log writes instead of touching the disk per sample
+            if time.time() - last_flush >= 15:
+                self._flush_log()
+                last_flush = time.time()
+            
+            await asyncio.sleep(0.2)
+    
+    def request_stop(self):
+        """Ask the event loop tasks to finish; cleanup happens in stop()"""
+        self.running = False
+        if self._frame_ready:
+            self._frame_ready.set()
     
     def stop(self):
         """Stop all operations"""
         print("\nShutting down...")
         self.running = False
         
+        if self._tty_attrs is not None:
+            termios.tcsetattr(sys.stdin.fileno(), termios.TCSADRAIN, self._tty_attrs)
+            self._tty_attrs = None
+        
         if self.recording:
             self.stop_recording()
         
+        # Write out any telemetry not yet flushed
+        self._flush_log()
+        if self._log_file:
+            self._log_file.close()
+            self._log_file = None
+        
         if self.camera:
             self.camera.release()
         
-        cv2.destroyAllWindows()
+        try:
+            cv2.destroyAllWindows()
+        except cv2.error:
+            pass  # Headless builds have no window support
         
+        # Drop queued key commands and let any in-flight move finish before parking
+        self._commands.shutdown(wait=True, cancel_futures=True)
         if self.robot:
             try:
                 self.robot.do_action('sit', 1, 80)
             except:
                 pass
+            if hasattr(self.robot, 'close'):
+                self.robot.close()
         
         print("Control hub stopped.")
 
 def main():
+    # Leave cores for the camera driver: cap OpenCV's worker pool, and on a
+    # 4-core Pi keep this process (and every thread it spawns) on cores 2-3
+    cv2.setNumThreads(2)
+    if hasattr(os, 'sched_setaffinity') and {2, 3} <= os.sched_getaffinity(0):
+        os.sched_setaffinity(0, {2, 3})
+    
     hub = PicrawlerControlHub()
     
     try:
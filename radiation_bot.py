@@ -7,97 +7,190 @@ Hackathon project for autonomous radiation mapping and source detection
 from picrawler import Picrawler
 import time
 import math
-import json
 import threading
+import ctypes
+from collections import deque
 from datetime import datetime
 import numpy as np
-import matplotlib.pyplot as plt
-from collections import defaultdict
 
 try:
-    import RPi.GPIO as GPIO
+    import pigpio
 except ImportError:
-    print("Warning: RPi.GPIO not available, using mock sensor")
-    GPIO = None
+    print("Warning: pigpio not available, using mock sensor")
+    pigpio = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# J305ß tube sensitivity: 65 cps/(μR/s) for gamma
+# 1 μR/s ≈ 0.036 µSv/h (rough conversion)
+_CPM_TO_USVH = (1.0 / 60.0 / 65.0) * 0.036 * 3600.0
+
+# Simulated field for mock mode: background plus a point source
+_MOCK_BACKGROUND = 20
+_MOCK_SOURCE_STRENGTH = 1000
+
+# One row per collected sample: wall time, position, heading, readings and pulse statistics
+SAMPLE_DTYPE = np.dtype([('t', 'f8'), ('x', 'f8'), ('y', 'f8'), ('h', 'f8'), ('cpm', 'f8'), ('usvh', 'f8'),
+                         ('n', 'u4'), ('cpm_std', 'f8')])
+
+# Settle time after each action; do_action itself returns once the servos have moved
+_ACTION_TIME = {'forward': 0.25, 'backward': 0.25, 'turn left': 0.2, 'turn right': 0.2, 'stand': 0.4, 'sit': 0.4}
+
+# (cos, sin) for each 45° heading the gait can turn to
+_DIR = [(math.cos(math.radians(a)), math.sin(math.radians(a))) for a in range(0, 360, 45)]
+
+def _to_json(obj, indent=False):
+    """Serialize obj to a JSON string, using orjson when it is installed"""
+    if orjson:
+        option = orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option).decode()
+    import json
+    return json.dumps(obj, indent=2 if indent else None)
 
 class RadiationSensor:
-    def __init__(self, pin=18, sensor_type="cajoe_d_v1_1"):
+    def __init__(self, pin=18, sensor_type="cajoe_d_v1_1", mock_seed=None):
         self.pin = pin
         self.sensor_type = sensor_type
-        self.pulse_count = 0
-        self.start_time = time.time()
+        self._count = ctypes.c_uint64(0)  # Never reset, for counting over an interval
+        self.start_time = time.monotonic()
         self.reading_interval = 5.0  # seconds for stable CPM reading
         self.last_reading = 0
-        self.pulse_buffer = []
+        # Pulse timestamps not yet folded into the window, bounded if nobody reads
+        self._pending = deque(maxlen=65536)
+        
+        # Rolling CPM window: one pulse count per second over the last minute
+        self._buckets = np.zeros(60, dtype=np.uint32)
+        self._last_bucket = int(time.monotonic())
+        self._reset_at = 0.0
+        self._bucket_lock = threading.Lock()
+        self._rng = np.random.default_rng(mock_seed)
         
         # Cajoe D-v1.1 specific settings
         # VIN pin is pulse output, direct connection to GPIO
         # Tube: J305ß, Sensitivity: 65cps/(μR/s) for gamma
         
-        if GPIO:
-            GPIO.setmode(GPIO.BCM)
+        self._pi = None
+        self._cb = None
+        if pigpio:
+            pi = pigpio.pi()
+            if pi.connected:
+                self._pi = pi
+            else:
+                print("Warning: pigpio daemon not running, using mock sensor")
+        self.connected = self._pi is not None
+        # Fixed at construction; cleanup() must not turn real readings into simulated ones
+        self.mock = not self.connected
+        
+        if self._pi:
+            self._pi.set_mode(self.pin, pigpio.INPUT)
             # Use pull-down for Cajoe D-v1.1 (active high pulses)
             # If using voltage divider, may need pull-up instead
-            GPIO.setup(self.pin, GPIO.IN, pull_up_down=GPIO.PUD_DOWN)
+            self._pi.set_pull_up_down(self.pin, pigpio.PUD_DOWN)
+            # Ignore edges shorter than 50 µs; increase if getting false triggers
+            self._pi.set_glitch_filter(self.pin, 50)
             # Detect rising edge for Cajoe pulse detection
-            # Increase bouncetime if getting false triggers
-            GPIO.add_event_detect(self.pin, GPIO.RISING, callback=self._pulse_callback, bouncetime=10)
+            self._cb = self._pi.callback(self.pin, pigpio.RISING_EDGE, self._pulse_callback)
+    
+    def cleanup(self):
+        """Cancel pulse detection and release the pigpio connection"""
+        if self._cb:
+            self._cb.cancel()
+            self._cb = None
+        if self._pi:
+            self._pi.stop()
+            self._pi = None
+        self.connected = False
         
-    def _pulse_callback(self, channel):
+    def _pulse_callback(self, gpio, level, tick):
         """Callback for radiation pulse detection from Cajoe D-v1.1"""
-        current_time = time.time()
-        self.pulse_count += 1
-        self.pulse_buffer.append(current_time)
-        
-        # Keep only last 60 seconds of pulses for rolling CPM
-        cutoff_time = current_time - 60
-        self.pulse_buffer = [t for t in self.pulse_buffer if t > cutoff_time]
+        self._count.value += 1
+        self._pending.append(time.monotonic())
+    
+    @property
+    def total_pulses(self):
+        """Pulses detected since the sensor was created"""
+        return self._count.value
+    
+    def _fold(self):
+        """Move pending pulse timestamps into the rolling CPM window (lock held)"""
+        pending = self._pending
+        while pending:
+            current_time = pending.popleft()
+            if current_time < self._reset_at:
+                continue
+            
+            second = int(current_time)
+            self._advance(second)
+            # The window may already have advanced past a late timestamp
+            if self._last_bucket - second < 60:
+                self._buckets[second % 60] += 1
+    
+    def _advance(self, second):
+        """Zero the buckets of seconds elapsed since the last update (lock held)"""
+        gap = second - self._last_bucket
+        if gap <= 0:
+            return
+        if gap >= 60:
+            self._buckets[:] = 0
+        else:
+            for s in range(self._last_bucket + 1, second + 1):
+                self._buckets[s % 60] = 0
+        self._last_bucket = second
+    
+    def reset(self):
+        """Discard the rolling CPM window for a fresh reading"""
+        with self._bucket_lock:
+            self._reset_at = time.monotonic()
+            self._pending.clear()
+            self._buckets[:] = 0
+            self._last_bucket = int(self._reset_at)
     
     def get_reading(self):
         """Get current radiation reading in CPM (counts per minute)"""
-        current_time = time.time()
+        current_time = time.monotonic()
         elapsed = current_time - self.start_time
         
         if elapsed >= self.reading_interval:
-            # Calculate CPM using pulse buffer for more accurate reading
-            recent_pulses = len(self.pulse_buffer)
-            cpm = recent_pulses  # Already filtered to last 60 seconds
-            
-            # Also calculate short-term average
-            if elapsed > 0:
-                short_term_cpm = (self.pulse_count / elapsed) * 60
-                # Use average of both methods for stability
-                self.last_reading = (cpm + short_term_cpm) / 2
-            else:
-                self.last_reading = cpm
-                
-            self.pulse_count = 0
+            # Pulses in the last 60 seconds of the rolling window
+            self.last_reading = self.get_instant_cpm()
             self.start_time = current_time
             return self.last_reading
         return self.last_reading
     
     def get_instant_cpm(self):
-        """Get instant CPM based on pulse buffer"""
-        return len(self.pulse_buffer)
+        """Get instant CPM based on the rolling 60 second window"""
+        with self._bucket_lock:
+            self._fold()
+            self._advance(int(time.monotonic()))
+            return int(self._buckets.sum())
     
     def convert_to_microsieverts(self, cpm):
-        """Convert CPM to µSv/h using Cajoe D-v1.1 sensitivity"""
-        # J305ß tube sensitivity: 65 cps/(μR/s) for gamma
-        # 1 μR/s ≈ 0.036 µSv/h (rough conversion)
-        if cpm <= 0:
-            return 0
-        cps = cpm / 60
-        micro_r_per_sec = cps / 65
-        micro_sv_per_hour = micro_r_per_sec * 0.036 * 3600
-        return micro_sv_per_hour
+        """Convert CPM (scalar or array) to µSv/h using Cajoe D-v1.1 sensitivity"""
+        return np.maximum(cpm, 0) * _CPM_TO_USVH
     
     def get_mock_reading(self, x, y, source_x=50, source_y=50):
-        """Mock sensor for testing - simulates radiation field"""
-        distance = math.sqrt((x - source_x)**2 + (y - source_y)**2)
-        base_radiation = 20  # background
-        source_strength = 1000
-        radiation = base_radiation + source_strength / (1 + distance/10)
-        return radiation + np.random.normal(0, radiation * 0.1)
+        """Mock sensor for testing - simulates radiation field at a point or arrays of points"""
+        if np.isscalar(x) and np.isscalar(y):
+            distance = math.hypot(x - source_x, y - source_y)
+        else:
+            distance = np.hypot(np.asarray(x) - source_x, np.asarray(y) - source_y)
+        return self.add_mock_noise(_MOCK_BACKGROUND + _MOCK_SOURCE_STRENGTH / (1 + distance/10))
+    
+    def compute_field(self, xs, ys, source_x=50, source_y=50):
+        """Noise-free mock field over a grid, indexed [y, x]"""
+        dx = np.asarray(xs, dtype=float) - source_x
+        dy = np.asarray(ys, dtype=float) - source_y
+        distance = np.hypot(dx[None, :], dy[:, None])
+        return _MOCK_BACKGROUND + _MOCK_SOURCE_STRENGTH / (1 + distance/10)
+    
+    def add_mock_noise(self, radiation):
+        """Add 10% Gaussian counting noise to simulated readings"""
+        if np.isscalar(radiation):
+            return radiation + self._rng.standard_normal() * radiation * 0.1
+        return radiation + self._rng.standard_normal(radiation.shape) * radiation * 0.1
 
 class PositionTracker:
     def __init__(self):
@@ -111,11 +204,13 @@ class PositionTracker:
         distance = steps * self.step_size
         
         if 'forward' in action:
-            self.x += distance * math.cos(math.radians(self.heading))
-            self.y += distance * math.sin(math.radians(self.heading))
+            c, s = _DIR[(int(self.heading) // 45) % 8]
+            self.x += distance * c
+            self.y += distance * s
         elif 'backward' in action:
-            self.x -= distance * math.cos(math.radians(self.heading))
-            self.y -= distance * math.sin(math.radians(self.heading))
+            c, s = _DIR[(int(self.heading) // 45) % 8]
+            self.x -= distance * c
+            self.y -= distance * s
         elif 'turn left' in action:
             self.heading += 45 * steps
         elif 'turn right' in action:
@@ -127,81 +222,167 @@ class PositionTracker:
         return (self.x, self.y, self.heading)
 
 class RadiationBot(Picrawler):
-    def __init__(self, sensor_pin=18):
+    def __init__(self, sensor_pin=18, log_file="radiation_data.ndjson", mock_seed=None):
         super().__init__()
-        self.sensor = RadiationSensor(sensor_pin)
+        self.sensor = RadiationSensor(sensor_pin, mock_seed=mock_seed)
         self.tracker = PositionTracker()
-        self.radiation_data = []
-        self.heatmap_data = defaultdict(list)
+        self._samples = np.empty(256, dtype=SAMPLE_DTYPE)
+        self._n = 0
+        
+        # Heatmap accumulators: 10 cm cells covering +/-200 cm around the start
+        self._grid_res = 10
+        self._grid_extent = 200
+        n = 2 * self._grid_extent // self._grid_res + 1
+        self.sum_grid = np.zeros((n, n))
+        self.count_grid = np.zeros((n, n), dtype=np.int32)
+        
+        # Mock mode samples a field precomputed at the grid cell centres
+        self._field = None
+        if self.sensor.mock:
+            centres = (np.arange(n) - n // 2) * self._grid_res
+            self._field = self.sensor.compute_field(centres, centres)
+        
         self.exploration_grid = []
         self.is_exploring = False
         self.max_radiation = 0
         self.max_radiation_pos = (0, 0)
+        self.overlap_moves = False  # Walk to the next grid point while sampling
+        
+        # Samples are appended here as they are taken, one JSON object per line
+        self._log = open(log_file, 'a') if log_file else None
         
         print("RadiationBot initialized!")
         print("Starting calibration...")
         self.do_action('stand', 1, 80)
         time.sleep(1)
     
-    def collect_radiation_sample(self, duration=5):
-        """Collect radiation reading at current position"""
+    def collect_radiation_sample(self, duration=5, moves=None):
+        """Collect radiation reading at current position, optionally walking moves meanwhile"""
         print(f"Collecting radiation sample for {duration} seconds...")
         
-        readings = []
-        microsievert_readings = []
-        start_time = time.time()
+        # Clear pulse window for fresh reading
+        self.sensor.reset()
+        start_pulses = self.sensor.total_pulses
+        start_time = time.monotonic()
+        x, y, heading = self.tracker.get_position()
+        
+        # The sensor counts on interrupts, so the legs can move during the window
+        mover = None
+        span = {}
+        if moves:
+            mover = threading.Thread(target=self._run_moves, args=(moves, span))
+            mover.start()
         
-        # Clear pulse buffer for fresh reading
-        if hasattr(self.sensor, 'pulse_buffer'):
-            self.sensor.pulse_buffer = []
+        # Count pulses over the whole interval instead of polling
+        time.sleep(duration)
+        if mover:
+            mover.join()
         
-        while time.time() - start_time < duration:
-            if GPIO:
-                reading = self.sensor.get_reading()
-                instant_cpm = self.sensor.get_instant_cpm()
-                microsieverts = self.sensor.convert_to_microsieverts(reading)
+        elapsed = time.monotonic() - start_time
+        if span and elapsed > 0:
+            # Credit the counts to where they were taken: the start before the
+            # move, the path midpoint during it and the end point after it
+            end_x, end_y, _ = self.tracker.get_position()
+            moving = span['end'] - span['start']
+            w_start = (span['start'] - start_time + moving / 2) / elapsed
+            x = w_start * x + (1 - w_start) * end_x
+            y = w_start * y + (1 - w_start) * end_y
+        if not self.sensor.mock:
+            counts = self.sensor.total_pulses - start_pulses
+            avg_reading = counts * 60.0 / elapsed
+            avg_microsieverts = self.sensor.convert_to_microsieverts(avg_reading)
+        else:
+            # Mock reading for testing
+            cell = self._cell(x, y)
+            if self._field is not None and cell:
+                avg_reading = self.sensor.add_mock_noise(self._field[cell])
             else:
-                # Mock reading for testing
-                x, y, _ = self.tracker.get_position()
-                reading = self.sensor.get_mock_reading(x, y)
-                instant_cpm = reading
-                microsieverts = reading * 0.01  # Mock conversion
-            
-            readings.append(reading)
-            microsievert_readings.append(microsieverts)
-            print(f"  {time.time() - start_time:.1f}s: {reading:.1f} CPM ({microsieverts:.2f} µSv/h)")
-            time.sleep(1.0)
+                avg_reading = self.sensor.get_mock_reading(x, y)
+            avg_microsieverts = avg_reading * 0.01  # Mock conversion
+            counts = round(avg_reading * elapsed / 60.0)
         
-        avg_reading = sum(readings) / len(readings) if readings else 0
-        avg_microsieverts = sum(microsievert_readings) / len(microsievert_readings) if microsievert_readings else 0
-        x, y, heading = self.tracker.get_position()
+        # Counting statistics: Poisson standard deviation of the CPM estimate
+        cpm_std = math.sqrt(counts) * 60.0 / elapsed if elapsed > 0 else 0.0
         
-        data_point = {
-            'timestamp': datetime.now().isoformat(),
-            'position': (x, y),
-            'heading': heading,
-            'radiation_cpm': avg_reading,
-            'radiation_microsieverts': avg_microsieverts,
-            'readings': readings,
-            'microsievert_readings': microsievert_readings
-        }
+        # Grow the sample table by doubling when full
+        if self._n == len(self._samples):
+            grown = np.empty(2 * len(self._samples), dtype=SAMPLE_DTYPE)
+            grown[:self._n] = self._samples
+            self._samples = grown
+        self._samples[self._n] = (time.time(), x, y, heading, avg_reading, avg_microsieverts, counts, cpm_std)
+        self._n += 1
         
-        self.radiation_data.append(data_point)
-        self.heatmap_data[(round(x/10)*10, round(y/10)*10)].append(avg_reading)
+        if self._log:
+            self._log.write(_to_json(self._sample_dict(self._samples[self._n - 1])) + '\n')
+            self._log.flush()
+        self._accumulate(x, y, avg_reading)
         
         if avg_reading > self.max_radiation:
             self.max_radiation = avg_reading
             self.max_radiation_pos = (x, y)
         
-        print(f"Position: ({x:.1f}, {y:.1f}), Radiation: {avg_reading:.1f} CPM ({avg_microsieverts:.2f} µSv/h)")
+        print(f"Position: ({x:.1f}, {y:.1f}), Radiation: {avg_reading:.1f} ± {cpm_std:.1f} CPM ({avg_microsieverts:.2f} µSv/h)")
         return avg_reading
     
+    @property
+    def sample_count(self):
+        """Number of radiation samples collected"""
+        return self._n
+    
+    @property
+    def samples(self):
+        """Collected samples as a structured array view"""
+        return self._samples[:self._n]
+    
+    @property
+    def radiation_data(self):
+        """Collected samples as a list of dicts, for JSON export"""
+        return [self._sample_dict(row) for row in self.samples]
+    
+    @staticmethod
+    def _sample_dict(row):
+        """Convert a sample row to its JSON record"""
+        return {
+            'timestamp': datetime.fromtimestamp(row['t']).isoformat(),
+            'position': (float(row['x']), float(row['y'])),
+            'heading': float(row['h']),
+            'radiation_cpm': float(row['cpm']),
+            'radiation_microsieverts': float(row['usvh']),
+            'counts': int(row['n']),
+            'radiation_cpm_std': float(row['cpm_std'])
+        }
+    
+    def _cell(self, x, y):
+        """Grid index (iy, ix) of the cell containing (x, y), or None outside the grid"""
+        n = self.count_grid.shape[0]
+        ix = int(round(x / self._grid_res)) + n // 2
+        iy = int(round(y / self._grid_res)) + n // 2
+        if 0 <= ix < n and 0 <= iy < n:
+            return iy, ix
+        return None
+    
+    def _accumulate(self, x, y, reading):
+        """Add a reading to the heatmap cell containing (x, y)"""
+        cell = self._cell(x, y)
+        if cell:
+            self.sum_grid[cell] += reading
+            self.count_grid[cell] += 1
+    
+    def _run_moves(self, moves, span=None):
+        """Execute a sequence of (action, steps) moves, timing them into span if given"""
+        if span is not None:
+            span['start'] = time.monotonic()
+        for action, steps in moves:
+            self.move_and_track(action, steps)
+        if span is not None:
+            span['end'] = time.monotonic()
+    
     def move_and_track(self, action, steps, speed=60):
         """Execute movement and update position tracking"""
         print(f"Moving: {action}, {steps} steps")
         self.do_action(action, steps, speed)
         self.tracker.update_position(action, steps)
-        time.sleep(0.5)  # Allow movement to complete
+        time.sleep(_ACTION_TIME.get(action, 0.5))  # Let the legs settle
     
     def explore_grid(self, grid_size=5, step_distance=2):
         """Systematic grid exploration"""
@@ -215,26 +396,78 @@ class RadiationBot(Picrawler):
                     
                 print(f"Exploring grid point ({row}, {col})")
                 
-                # Collect radiation sample
-                radiation = self.collect_radiation_sample(2)
-                
-                # Move to next grid point
+                # Moves to next grid point
+                moves = []
                 if col < grid_size - 1:  # Not last column
-                    self.move_and_track('forward', step_distance)
+                    moves = [('forward', step_distance)]
                 elif row < grid_size - 1:  # End of row, not last row
-                    if row % 2 == 0:  # Even row - turn right
-                        self.move_and_track('turn right', 1)
-                        self.move_and_track('forward', step_distance)
-                        self.move_and_track('turn right', 1)
-                    else:  # Odd row - turn left
-                        self.move_and_track('turn left', 1)
-                        self.move_and_track('forward', step_distance)
-                        self.move_and_track('turn left', 1)
+                    turn = 'turn right' if row % 2 == 0 else 'turn left'  # Even row - turn right
+                    moves = [(turn, 1), ('forward', step_distance), (turn, 1)]
+                
+                # Collect radiation sample
+                if self.overlap_moves:
+                    radiation = self.collect_radiation_sample(2, moves)
+                else:
+                    radiation = self.collect_radiation_sample(2)
+                    self._run_moves(moves)
         
         print("Grid exploration complete!")
         self.is_exploring = False
         return self.radiation_data
     
+    def _probe_directions(self, current_radiation):
+        """Probe around the current position, returning the best direction and its reading"""
+        # Test all four directions
+        directions = ['forward', 'turn right', 'turn right', 'turn right']
+        best_direction = None
+        best_radiation = current_radiation
+        
+        for direction in directions:
+            # Turn to test direction
+            if 'turn' in direction:
+                self.move_and_track(direction, 1)
+                continue
+            
+            # Move forward and test
+            self.move_and_track('forward', 1)
+            test_radiation = self.collect_radiation_sample(1)
+            
+            if test_radiation > best_radiation:
+                best_radiation = test_radiation
+                best_direction = 'forward'
+            
+            # Move back
+            self.move_and_track('backward', 1)
+            self.move_and_track('turn right', 1)  # Continue rotation
+        
+        return best_direction, best_radiation
+    
+    def _gradient_heading(self, k=8):
+        """Heading up the radiation gradient fitted to the nearest k samples, snapped to 45°"""
+        if self._n < 5:
+            return None
+        
+        samples = self.samples
+        x, y, _ = self.tracker.get_position()
+        dx = samples['x'] - x
+        dy = samples['y'] - y
+        nearest = np.argsort(np.hypot(dx, dy))[:k]
+        
+        # Plane fit cpm ≈ gx*dx + gy*dy + c around the current position
+        design = np.column_stack([dx[nearest], dy[nearest], np.ones(len(nearest))])
+        (gx, gy, _), *_ = np.linalg.lstsq(design, samples['cpm'][nearest], rcond=None)
+        if gx == 0 and gy == 0:
+            return None
+        return (round(math.degrees(math.atan2(gy, gx)) / 45) * 45) % 360
+    
+    def _turn_to(self, heading):
+        """Turn in 45° steps to face the given heading"""
+        steps = round((heading - self.tracker.heading) % 360 / 45) % 8
+        if 0 < steps <= 4:
+            self.move_and_track('turn left', steps)
+        elif steps > 4:
+            self.move_and_track('turn right', 8 - steps)
+    
     def find_radiation_source(self, max_steps=20):
         """Navigate toward highest radiation source using gradient ascent"""
         print("Starting radiation source detection...")
@@ -243,38 +476,28 @@ class RadiationBot(Picrawler):
         steps_taken = 0
         
         while steps_taken < max_steps:
-            # Test all four directions
-            directions = ['forward', 'turn right', 'turn right', 'turn right']
-            best_direction = None
-            best_radiation = current_radiation
-            
-            for direction in directions:
-                # Turn to test direction
-                if 'turn' in direction:
-                    self.move_and_track(direction, 1)
-                    continue
-                
-                # Move forward and test
-                self.move_and_track('forward', 1)
-                test_radiation = self.collect_radiation_sample(1)
-                
-                if test_radiation > best_radiation:
-                    best_radiation = test_radiation
-                    best_direction = 'forward'
-                
-                # Move back
-                self.move_and_track('backward', 1)
-                self.move_and_track('turn right', 1)  # Continue rotation
+            heading = self._gradient_heading()
             
-            if best_direction:
+            if heading is None:
+                # Not enough spread-out samples to fit a gradient yet
+                best_direction, best_radiation = self._probe_directions(current_radiation)
+                if not best_direction:
+                    print("No improvement found, source likely found!")
+                    break
                 # Move in best direction
                 self.move_and_track('forward', 2)
                 current_radiation = best_radiation
-                print(f"Moving toward source, radiation: {current_radiation:.1f} CPM")
             else:
-                print("No improvement found, source likely found!")
-                break
-                
+                # Head up the fitted gradient and sample once on arrival
+                self._turn_to(heading)
+                self.move_and_track('forward', 2)
+                new_radiation = self.collect_radiation_sample(2)
+                if new_radiation <= current_radiation:
+                    print("No improvement found, source likely found!")
+                    break
+                current_radiation = new_radiation
+            
+            print(f"Moving toward source, radiation: {current_radiation:.1f} CPM")
             steps_taken += 1
         
         final_pos = self.tracker.get_position()
@@ -283,23 +506,39 @@ class RadiationBot(Picrawler):
         
     def generate_heatmap(self, save_file="radiation_heatmap.png"):
         """Generate and save radiation heatmap"""
-        if not self.radiation_data:
+        if not self._n:
             print("No radiation data collected yet!")
             return
         
         print("Generating radiation heatmap...")
         
-        # Extract positions and radiation levels
-        positions = [data['position'] for data in self.radiation_data]
-        radiations = [data['radiation_cpm'] for data in self.radiation_data]
+        # Imported on first use; Agg renders without a GUI toolkit
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        
+        # Crop to the visited cells so the image only spans explored ground
+        visited = self.count_grid > 0
+        if not visited.any():
+            print("No samples inside the heatmap grid!")
+            return
+        rows = np.flatnonzero(visited.any(axis=1))
+        cols = np.flatnonzero(visited.any(axis=0))
+        r0, r1 = rows[0], rows[-1] + 1
+        c0, c1 = cols[0], cols[-1] + 1
         
-        x_coords = [pos[0] for pos in positions]
-        y_coords = [pos[1] for pos in positions]
+        # Mean reading per cell, unvisited cells left blank
+        counts = self.count_grid[r0:r1, c0:c1]
+        mean_grid = np.ma.masked_where(counts == 0, self.sum_grid[r0:r1, c0:c1] / np.maximum(counts, 1))
+        centre = self.count_grid.shape[0] // 2
+        res = self._grid_res
+        extent = ((c0 - centre - 0.5) * res, (c1 - centre - 0.5) * res,
+                  (r0 - centre - 0.5) * res, (r1 - centre - 0.5) * res)
         
         # Create heatmap
         plt.figure(figsize=(10, 8))
-        scatter = plt.scatter(x_coords, y_coords, c=radiations, cmap='hot', s=100)
-        plt.colorbar(scatter, label='Radiation (CPM)')
+        image = plt.imshow(mean_grid, cmap='hot', origin='lower', extent=extent)
+        plt.colorbar(image, label='Radiation (CPM)')
         plt.xlabel('X Position (cm)')
         plt.ylabel('Y Position (cm)')
         plt.title('Radiation Heatmap')
@@ -320,9 +559,16 @@ class RadiationBot(Picrawler):
     def save_data(self, filename="radiation_data.json"):
         """Save all collected radiation data"""
         with open(filename, 'w') as f:
-            json.dump(self.radiation_data, f, indent=2)
+            f.write(_to_json(self.radiation_data, indent=True))
         print(f"Data saved to {filename}")
     
+    def close(self):
+        """Close the sample log and release the sensor"""
+        if self._log:
+            self._log.close()
+            self._log = None
+        self.sensor.cleanup()
+    
     def demo_mode(self):
         """Run complete demonstration"""
         print("=== RADIATION DETECTION SPIDER BOT DEMO ===")
@@ -342,7 +588,7 @@ class RadiationBot(Picrawler):
             self.save_data()
             
             print("=== DEMO COMPLETE ===")
-            print(f"Total samples collected: {len(self.radiation_data)}")
+            print(f"Total samples collected: {self.sample_count}")
             print(f"Highest radiation: {self.max_radiation:.1f} CPM at {self.max_radiation_pos}")
             
         except KeyboardInterrupt:
@@ -350,8 +596,6 @@ class RadiationBot(Picrawler):
             self.is_exploring = False
         finally:
             self.do_action('sit', 1, 80)
-            if GPIO:
-                GPIO.cleanup()
 
 if __name__ == "__main__":
     # Create radiation bot
@@ -364,5 +608,4 @@ if __name__ == "__main__":
     except KeyboardInterrupt:
         print("\nShutting down...")
     finally:
-        if GPIO:
-            GPIO.cleanup()
\ No newline at end of file
+        bot.close()
\ No newline at end of file
@@ -28,6 +28,47 @@ def print_menu():
     print("  ESC - Quit")
     print("=====================================")
 
+def take_reading(bot):
+    radiation = bot.collect_radiation_sample(3)
+    print(f"Radiation reading: {radiation:.1f} CPM")
+
+def explore(bot):
+    print("Starting grid exploration...")
+    bot.explore_grid(grid_size=3, step_distance=2)
+
+def find_source(bot):
+    print("Starting source detection...")
+    bot.find_radiation_source(max_steps=10)
+
+def run_demo(bot):
+    print("Starting full demo...")
+    bot.demo_mode()
+
+def show_info(bot):
+    pos = bot.tracker.get_position()
+    print(f"Position: ({pos[0]:.1f}, {pos[1]:.1f}), Heading: {pos[2]:.0f}°")
+    print(f"Samples collected: {bot.sample_count}")
+    if bot.max_radiation > 0:
+        print(f"Max radiation: {bot.max_radiation:.1f} CPM at {bot.max_radiation_pos}")
+
+# Key -> command handler, each called with the bot
+HANDLERS = {
+    'w': lambda bot: bot.move_and_track('forward', 2, 60),
+    's': lambda bot: bot.move_and_track('backward', 2, 60),
+    'a': lambda bot: bot.move_and_track('turn left', 1, 60),
+    'd': lambda bot: bot.move_and_track('turn right', 1, 60),
+    'q': lambda bot: bot.do_action('stand', 1, 80),
+    'e': lambda bot: bot.do_action('sit', 1, 80),
+    'r': take_reading,
+    'g': explore,
+    'f': find_source,
+    'h': lambda bot: bot.generate_heatmap(),
+    'v': lambda bot: bot.save_data(),
+    ' ': run_demo,
+    'i': show_info,
+    '?': lambda bot: print_menu(),
+}
+
 def main():
     print("Initializing Radiation Bot...")
     bot = RadiationBot()
@@ -43,49 +84,18 @@ def main():
             
             if key == '\x1b':  # ESC
                 break
-            elif key == 'w':
-                bot.move_and_track('forward', 2, 60)
-            elif key == 's':
-                bot.move_and_track('backward', 2, 60)
-            elif key == 'a':
-                bot.move_and_track('turn left', 1, 60)
-            elif key == 'd':
-                bot.move_and_track('turn right', 1, 60)
-            elif key == 'q':
-                bot.do_action('stand', 1, 80)
-            elif key == 'e':
-                bot.do_action('sit', 1, 80)
-            elif key == 'r':
-                radiation = bot.collect_radiation_sample(3)
-                print(f"Radiation reading: {radiation:.1f} CPM")
-            elif key == 'g':
-                print("Starting grid exploration...")
-                bot.explore_grid(grid_size=3, step_distance=2)
-            elif key == 'f':
-                print("Starting source detection...")
-                bot.find_radiation_source(max_steps=10)
-            elif key == 'h':
-                bot.generate_heatmap()
-            elif key == 'v':
-                bot.save_data()
-            elif key == ' ':
-                print("Starting full demo...")
-                bot.demo_mode()
-            elif key == 'i':
-                pos = bot.tracker.get_position()
-                print(f"Position: ({pos[0]:.1f}, {pos[1]:.1f}), Heading: {pos[2]:.0f}°")
-                print(f"Samples collected: {len(bot.radiation_data)}")
-                if bot.max_radiation > 0:
-                    print(f"Max radiation: {bot.max_radiation:.1f} CPM at {bot.max_radiation_pos}")
-            elif key == '?':
-                print_menu()
+            
+            handler = HANDLERS.get(key)
+            if handler:
+                handler(bot)
             else:
-                print(f"Unknown command: {key}. Press '?' for help.")
+                print(f"Unknown command: {key!r}. Press '?' for help.")
                 
     except KeyboardInterrupt:
         print("\nShutting down...")
     finally:
         bot.do_action('sit', 1, 80)
+        bot.close()
         print("Bot safely parked. Goodbye!")
 
 if __name__ == "__main__":
@@ -9,17 +9,16 @@ import time
 import signal
 import sys
 
+sensor = None
+
 def signal_handler(sig, frame):
     print("\nTest interrupted by user")
-    if 'sensor' in globals():
-        try:
-            import RPi.GPIO as GPIO
-            GPIO.cleanup()
-        except:
-            pass
+    if sensor:
+        sensor.cleanup()
     sys.exit(0)
 
 def main():
+    global sensor
     print("=== Cajoe D-v1.1 Radiation Detector Test ===")
     print("Press Ctrl+C to stop\n")
     
@@ -31,6 +30,17 @@ def main():
         print("Initializing Cajoe D-v1.1 on GPIO18...")
         sensor = RadiationSensor(pin=18, sensor_type="cajoe_d_v1_1")
         
+        if sensor.mock:
+            print("pigpio not available - running in mock mode")
+            print("Install pigpio and start pigpiod on Raspberry Pi for real sensor testing")
+            
+            # Mock test
+            for i in range(10):
+                mock_reading = sensor.get_mock_reading(0, 0)
+                print(f"Mock reading {i+1}: {mock_reading:.1f} CPM")
+                time.sleep(1)
+            return
+        
         print("Sensor initialized successfully!")
         print("Waiting for radiation pulses...\n")
         
@@ -46,40 +56,33 @@ def main():
             cpm = sensor.get_reading()
             instant_cpm = sensor.get_instant_cpm()
             microsieverts = sensor.convert_to_microsieverts(cpm)
-            total_pulses = sensor.pulse_count
+            total_pulses = sensor.total_pulses
             
             # Display status
-            print(f"Time: {elapsed:6.1f}s | "
-                  f"CPM: {cpm:6.1f} | "
-                  f"Instant: {instant_cpm:3.0f} | "
-                  f"µSv/h: {microsieverts:6.2f} | "
-                  f"Total pulses: {total_pulses}")
+            lines = [f"Time: {elapsed:6.1f}s | "
+                     f"CPM: {cpm:6.1f} | "
+                     f"Instant: {instant_cpm:3.0f} | "
+                     f"µSv/h: {microsieverts:6.2f} | "
+                     f"Total pulses: {total_pulses}"]
             
             # Check for new pulses
             if total_pulses > last_pulse_count:
-                print(f"  >>> PULSE DETECTED! (+{total_pulses - last_pulse_count})")
+                lines.append(f"  >>> PULSE DETECTED! (+{total_pulses - last_pulse_count})")
                 last_pulse_count = total_pulses
             
             # Radiation level assessment
             if cpm > 100:
-                print("  ⚠️  HIGH RADIATION DETECTED!")
+                lines.append("  ⚠️  HIGH RADIATION DETECTED!")
             elif cpm > 50:
-                print("  ⚡ Elevated radiation")
+                lines.append("  ⚡ Elevated radiation")
             elif cpm < 5:
-                print("  📡 Check sensor connection")
+                lines.append("  📡 Check sensor connection")
             
-            time.sleep(2)
+            # One write per update rather than one per line
+            sys.stdout.write("\n".join(lines) + "\n")
+            sys.stdout.flush()
             
-    except ImportError:
-        print("RPi.GPIO not available - running in mock mode")
-        print("Install on Raspberry Pi for real sensor testing")
-        
-        # Mock test
-        sensor = RadiationSensor(pin=18)
-        for i in range(10):
-            mock_reading = sensor.get_mock_reading(0, 0)
-            print(f"Mock reading {i+1}: {mock_reading:.1f} CPM")
-            time.sleep(1)
+            time.sleep(2)
             
     except Exception as e:
         print(f"Error: {e}")